@@ -0,0 +1,77 @@
+# Benchmark the startup time of the `ukb` CLI
+# Fail if a subcommand imports a heavy module at startup or is slower than the allowed time
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from ukb_tools.cli import COMMANDS
+
+HEAVY_MODULES = ["pandas", "numpy", "scipy", "tqdm", "pyarrow"]
+
+# Run `ukb <command> --help` and print the heavy modules that got imported:
+PROBE = """
+import sys
+from ukb_tools import cli
+try:
+    cli.main({argv!r})
+except SystemExit:
+    pass
+print("HEAVY:" + ",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--repeat", help="Number of runs per command.", type=int, default=10
+    )
+    parser.add_argument(
+        "--max_ms",
+        help="Maximum allowed median startup time in milliseconds.",
+        type=float,
+        default=300.0,
+    )
+    return parser.parse_args()
+
+
+def probe(argv):
+    code = PROBE.format(argv=argv, heavy=HEAVY_MODULES)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    imported = result.stdout.rsplit("HEAVY:", 1)[-1].strip()
+    return elapsed, [m for m in imported.split(",") if m]
+
+
+def main():
+    args = parse_args()
+    failed = False
+    for argv in [["--help"]] + [[name, "--help"] for name in COMMANDS]:
+        runs = [probe(argv) for _ in range(args.repeat)]
+        median = statistics.median(elapsed for elapsed, _ in runs)
+        imported = sorted({m for _, modules in runs for m in modules})
+        status = "OK"
+        if imported or median > args.max_ms:
+            status = "FAIL"
+            failed = True
+        print(
+            f"{status:4} ukb {' '.join(argv):24} {median:7.1f} ms"
+            + (f"  heavy imports: {', '.join(imported)}" if imported else "")
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
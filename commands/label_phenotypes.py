@@ -0,0 +1,12 @@
+# Script to label many phenotypes at once from a file of phenotype definitions
+# Save the case/control matrix and the first diagnosis date matrix in CSV
+import sys
+
+sys.path.append(".")
+sys.path.append("..")
+
+from ukb_tools.commands.label_phenotypes import main
+
+
+if __name__ == "__main__":
+    main()
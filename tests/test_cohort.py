@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from ukb_tools.cohort import Cohort
+
+
+def test_set_algebra_different_lengths():
+    short = Cohort([1, 5, 9])
+    long = Cohort([5, 9, 1000003, 2000001])
+
+    assert (short | long).to_list() == [1, 5, 9, 1000003, 2000001]
+    assert (long | short).to_list() == [1, 5, 9, 1000003, 2000001]
+    assert (short & long).to_list() == [5, 9]
+    assert (long & short).to_list() == [5, 9]
+    assert short.union(long, Cohort([3])).to_list() == [1, 3, 5, 9, 1000003, 2000001]
+    assert long.intersection(short, Cohort([9, 1000003])).to_list() == [9]
+
+
+def test_difference_with_longer_operand():
+    short = Cohort([1, 5, 9])
+    long = Cohort([5, 1000003])
+
+    assert (short - long).to_list() == [1, 9]
+    assert (long - short).to_list() == [1000003]
+    assert short.difference(long, Cohort([9])).to_list() == [1]
+
+
+def test_cardinality_membership_and_mask():
+    cohort = Cohort([7, 5, 7, 1000003])
+
+    assert len(cohort) == 3
+    assert 7 in cohort and 8 not in cohort
+    assert cohort.mask([7, 8, -1, 10**9]).tolist() == [True, False, False, False]
+    assert cohort.to_array().dtype == np.int32
+    assert len(Cohort()) == 0
+    assert Cohort({7, 1000003, 5}) == cohort
+    assert Cohort(eid for eid in [5, 7, 1000003]) == cohort
+
+
+def test_equality_ignores_trailing_zero_bytes():
+    cohort = Cohort([1, 2000001])
+    trimmed = cohort - Cohort([2000001])
+
+    assert trimmed.bits.size > Cohort([1]).bits.size
+    assert trimmed == Cohort([1])
+    assert Cohort.from_bits(np.zeros(16, dtype=np.uint8)) == Cohort()
+
+
+def test_binary_round_trip(tmp_path):
+    cohort = Cohort([1, 5, 1000003]) - Cohort([1000003])
+    path = tmp_path / "cohort.bin"
+    cohort.save(path)
+
+    assert Cohort.load(path) == cohort
+    assert Cohort.load(path).to_list() == [1, 5]
+
+
+def test_binary_load_rejects_other_files(tmp_path):
+    path = tmp_path / "eids.txt"
+    path.write_text("1\n2\n")
+
+    with pytest.raises(ValueError):
+        Cohort.load(path)
+
+
+def test_text_round_trip(tmp_path):
+    cohort = Cohort([1000003, 5, 1])
+    path = tmp_path / "eids.txt"
+    cohort.to_txt(path)
+
+    assert path.read_text() == "1\n5\n1000003\n"
+    assert Cohort.from_txt(path) == cohort
+
+
+def test_invalid_eids():
+    with pytest.raises(ValueError):
+        Cohort([1, -2])
+    with pytest.raises(ValueError):
+        Cohort([2**31])
+    with pytest.raises(TypeError):
+        Cohort([1.0, 2.0])
+    with pytest.raises(TypeError):
+        Cohort(np.array([1, np.nan]))
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ukb_tools.preprocess.filtering import (
+    filter_ethnicity,
+    filter_fully_populated_rows,
+    filter_partially_populated_rows,
+)
+
+
+@pytest.fixture
+def ukb_data():
+    return pd.DataFrame(
+        {
+            "eid": [1000001, 1000002, 1000003],
+            "21000-0.0": [1001, 1001, 2001],
+            "21000-1.0": [np.nan, 1001, np.nan],
+            "31-0.0": [0, np.nan, 1],
+        }
+    )
+
+
+@pytest.mark.parametrize("eid_as_index", [False, True])
+def test_cohorts_are_keyed_on_eid(ukb_data, eid_as_index):
+    if eid_as_index:
+        ukb_data = ukb_data.set_index("eid")
+
+    fully = filter_fully_populated_rows(ukb_data, ["31"], cohort=True)
+    partially = filter_partially_populated_rows(ukb_data, ["21000"], cohort=True)
+    british = filter_ethnicity(ukb_data, 1001, cohort=True)
+
+    assert fully.to_list() == [1000001, 1000003]
+    assert partially.to_list() == [1000001, 1000002, 1000003]
+    assert british.to_list() == [1000001, 1000002]
+    assert (fully & british).to_list() == [1000001]
+
+
+@pytest.mark.parametrize("eid_as_index", [False, True])
+def test_cohorts_drop_negative_eids(ukb_data, eid_as_index):
+    ukb_data["eid"] = [1000001, -1, 1000003]
+    if eid_as_index:
+        ukb_data = ukb_data.set_index("eid")
+
+    fully = filter_fully_populated_rows(ukb_data, ["21000"], cohort=True)
+    partially = filter_partially_populated_rows(ukb_data, ["21000"], cohort=True)
+    british = filter_ethnicity(ukb_data, 1001, cohort=True)
+
+    assert fully.to_list() == []
+    assert partially.to_list() == [1000001, 1000003]
+    assert british.to_list() == [1000001]
@@ -0,0 +1,75 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from ukb_tools.preprocess.labeling import (
+    get_first_diagnosis_date,
+    label_phenotypes,
+    load_phenotype_definitions,
+    match_phenotype,
+)
+
+DIAGNOSIS_DATE_FIELDS = {"41270": "41280"}
+
+
+@pytest.fixture
+def ukb_data():
+    # ICD10 codes with their dates (41280-0.2 is missing), self-reported codes and date 53:
+    return pd.DataFrame(
+        {
+            "eid": [1, 2, 3, 4, 5],
+            "41270-0.0": ["I21", "E11", np.nan, "I22", "E119"],
+            "41270-0.1": ["E11", np.nan, np.nan, "I21", np.nan],
+            "41270-0.2": [np.nan, "I23", np.nan, np.nan, np.nan],
+            "41280-0.0": ["2010-01-01", "2005-03-02", np.nan, "2001-01-01", "2012-12-12"],
+            "41280-0.1": ["2003-01-01", np.nan, np.nan, "1999-05-05", np.nan],
+            "20002-0.0": [np.nan, 1075.0, 1075.0, 1220.0, np.nan],
+            "20002-0.1": [1220.0, np.nan, np.nan, np.nan, np.nan],
+            "53-0.0": ["2006-01-01", "2006-02-01", "2007-05-05", "2006-03-01", "2006-04-01"],
+        }
+    ).set_index("eid")
+
+
+@pytest.fixture
+def phenotypes(tmp_path):
+    definitions = {
+        "CAD": [
+            {"field_id": "41270", "startswith": ["I21", "I22", "I23"]},
+            {"field_id": "20002", "isin": ["1075"]},
+        ],
+        "T2D": [
+            {"field_id": "41270", "startswith": ["E11"]},
+            {"field_id": "20002", "isin": ["1220"]},
+        ],
+        "MI": [{"field_id": "41270", "startswith": ["I23", "I21", "I22"]}],
+        "none": [{"field_id": "41270", "isin": ["Z99"]}],
+    }
+    definitions_file = tmp_path / "phenotypes.json"
+    definitions_file.write_text(json.dumps(definitions))
+    phenotypes = load_phenotype_definitions(str(definitions_file))
+    # Condition matching null values:
+    phenotypes["missing"] = [("41270", lambda val: val == "nan")]
+    return phenotypes
+
+
+def test_label_phenotypes_matches_row_wise(ukb_data, phenotypes):
+    labels, diagnosis_dates = label_phenotypes(
+        ukb_data, phenotypes, DIAGNOSIS_DATE_FIELDS
+    )
+
+    for name, phenotype_rules in phenotypes.items():
+        expected_labels = ukb_data.apply(
+            match_phenotype, axis=1, args=(phenotype_rules,)
+        )
+        expected_dates = ukb_data.apply(
+            get_first_diagnosis_date,
+            axis=1,
+            args=(phenotype_rules, DIAGNOSIS_DATE_FIELDS),
+        )
+        dates = diagnosis_dates[name].dt.strftime("%Y-%m-%d").fillna("")
+        assert labels[name].tolist() == expected_labels.tolist(), name
+        assert dates.tolist() == expected_dates.tolist(), name
+
+
+def test_identical_rules_share_conditions(phenotypes):
+    assert phenotypes["CAD"][0][1] is phenotypes["MI"][0][1]
@@ -0,0 +1,147 @@
+import os
+import json
+import threading
+import numpy as np
+import pytest
+from ukb_tools import client
+from ukb_tools.server import ExtractionHandler, ExtractionServer, ExtractionService
+from ukb_tools.server import serve
+from ukb_tools.tools import create_raw_data, get_newest_baskets
+
+
+def write_basket(ukb_folder, basket, fields, rows):
+    _, _, basket_id = basket.split("_")
+    os.makedirs(ukb_folder / basket, exist_ok=True)
+    (ukb_folder / basket / "fields.ukb").write_text("\n".join(fields) + "\n")
+    (ukb_folder / basket / f"ukb{basket_id}.csv").write_text("\n".join(rows) + "\n")
+
+
+@pytest.fixture
+def ukb_folder(tmp_path):
+    ukb_folder = tmp_path / "ukb"
+    write_basket(
+        ukb_folder,
+        "project_1_10",
+        ["31", "3066"],
+        ["eid,31-0.0,3066-0.0,3066-0.1", "1,0,5,6", "2,1,7,8", "3,0,9,"],
+    )
+    write_basket(
+        ukb_folder, "project_1_20", ["31"], ["eid,31-0.0", "1,1", "2,1", "3,0"]
+    )
+    return ukb_folder
+
+
+def buffer_owner(array):
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def extract_local(ukb_folder, field_to_basket, eids=None):
+    mapping_file = ukb_folder.parent / "mapping.json"
+    mapping_file.write_text(json.dumps(field_to_basket))
+    return create_raw_data(str(mapping_file), str(ukb_folder), eids=eids)
+
+
+def test_service_matches_cli(ukb_folder):
+    service = ExtractionService(str(ukb_folder), 1024**2)
+    fields = ["31", "3066", "9"]
+
+    mapping = service.get_baskets("1", fields)
+    assert mapping == get_newest_baskets(str(ukb_folder), "1", fields)
+
+    for eids in [None, [1, 3]]:
+        expected = extract_local(ukb_folder, mapping, eids)
+        for _ in range(2):  # Cold then cached columns
+            df = service.extract(mapping, eids)
+            assert df.to_csv(index=False) == expected.to_csv(index=False)
+            assert df.dtypes.equals(expected.dtypes)
+
+
+def test_service_serves_new_baskets_and_replaced_files(ukb_folder):
+    service = ExtractionService(str(ukb_folder), 1024**2)
+    mapping = service.get_baskets("1", ["31"])
+    assert service.extract(mapping)["31-0.0"].tolist() == [1, 1, 0]
+
+    # Replace the CSV of the basket with a different modification time:
+    csv_file = ukb_folder / "project_1_20" / "ukb20.csv"
+    csv_file.write_text("eid,31-0.0\n1,0\n2,0\n3,1\n")
+    os.utime(csv_file, ns=(0, os.stat(csv_file).st_mtime_ns + 10**9))
+    assert service.extract(mapping)["31-0.0"].tolist() == [0, 0, 1]
+
+    # Add a newer basket:
+    write_basket(ukb_folder, "project_1_30", ["31"], ["eid,31-0.0", "1,1"])
+    assert service.get_baskets("1", ["31"]) == {"31": "project_1_30"}
+
+
+def test_service_rejects_unknown_baskets(ukb_folder):
+    service = ExtractionService(str(ukb_folder), 1024**2)
+    outside = ukb_folder.parent / "x_y_z"
+    os.makedirs(outside)
+    (outside / "ukbz.csv").write_text("eid,31-0.0\n1,0\n")
+
+    with pytest.raises(ValueError):
+        service.extract({"31": "../x_y_z"})
+    with pytest.raises(ValueError):
+        service.check_folder(str(outside))
+
+
+def test_serve_requires_loopback_host(ukb_folder):
+    pytest.importorskip("pyarrow")
+    with pytest.raises(ValueError):
+        serve(str(ukb_folder), host="0.0.0.0")
+
+
+def test_client_matches_cli(ukb_folder):
+    server = ExtractionServer(("127.0.0.1", 0), ExtractionHandler)
+    server.service = ExtractionService(str(ukb_folder), 1024**2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        mapping = client.get_baskets(url, str(ukb_folder), "1", ["31", "3066"])
+        assert mapping == get_newest_baskets(str(ukb_folder), "1", ["31", "3066"])
+
+        data = client.extract(url, str(ukb_folder), mapping, [1, 2], format="csv")
+        expected = extract_local(ukb_folder, mapping, [1, 2])
+        assert data.decode() == expected.to_csv(index=False)
+
+        with pytest.raises(RuntimeError):
+            client.extract(url, str(ukb_folder), {"31": "../x_y_z"}, format="csv")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_cache_respects_memory_budget(ukb_folder, monkeypatch):
+    n_cols = 50
+    header = ["eid"] + [f"100-0.{i}" for i in range(n_cols)]
+    rows = [",".join(str(eid * n_cols + i) for i in range(n_cols + 1)) for eid in range(200)]
+    write_basket(ukb_folder, "project_2_10", ["100"], [",".join(header)] + rows)
+
+    service = ExtractionService(str(ukb_folder), 0)
+    column_size = int(
+        service.load_data(str(ukb_folder / "project_2_10" / "ukb10.csv"), ["eid"])["eid"]
+        .memory_usage(index=False, deep=True)
+    )
+    service = ExtractionService(str(ukb_folder), 5 * column_size)
+
+    # Record every column put in the cache:
+    put_columns = {}
+    put = service.cache.put
+
+    def recording_put(key, column):
+        put_columns[key] = column
+        put(key, column)
+
+    monkeypatch.setattr(service.cache, "put", recording_put)
+    service.load_data(str(ukb_folder / "project_2_10" / "ukb10.csv"), ["eid", "100"])
+
+    retained = {key: column for key, (column, _) in service.cache.columns.items()}
+    evicted = [column for key, column in put_columns.items() if key not in retained]
+    assert len(retained) == 5 and len(evicted) == n_cols + 1 - 5
+    assert service.cache.n_bytes <= service.cache.max_bytes
+    # Columns of a read can be disjoint rows of one block, so compare the buffers they keep alive:
+    kept_buffers = [buffer_owner(kept.to_numpy()) for kept in retained.values()]
+    for column in evicted:
+        assert all(buffer_owner(column.to_numpy()) is not k for k in kept_buffers)
@@ -0,0 +1,42 @@
+# Unified `ukb` command line interface
+# Heavy modules (pandas, scipy, tqdm, ...) are only imported by the subcommand that runs.
+import argparse
+import importlib
+
+# Subcommand name -> (module in ukb_tools.commands, help)
+COMMANDS = {
+    "baskets": (
+        "get_newest_baskets",
+        "Retrieve the most recent basket containing each field.",
+    ),
+    "create-data": (
+        "create_data",
+        "Merge the fields of the field-to-basket mapping in a single CSV file.",
+    ),
+    "eu-set": ("create_eu_set", "Create the European set of eids."),
+    "label": ("label_phenotypes", "Label many phenotypes at once."),
+    "serve": (
+        "serve",
+        "Start the extraction server keeping UKB data in memory across requests.",
+    ),
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ukb", description="UKB-Tools commands.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (module_name, help) in COMMANDS.items():
+        module = importlib.import_module(f".commands.{module_name}", __package__)
+        subparser = subparsers.add_parser(name, help=help, description=help)
+        module.add_arguments(subparser)
+        subparser.set_defaults(run=module.run)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
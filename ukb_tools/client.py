@@ -0,0 +1,36 @@
+# Thin client of the extraction server, only relying on the standard library
+import json
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+def request(url, path, payload):
+    req = Request(
+        url.rstrip("/") + path,
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urlopen(req) as response:
+            return response.read()
+    except HTTPError as e:
+        raise RuntimeError(f"Server error: {e.read().decode()}") from e
+
+
+def get_baskets(url, ukb_folder, project_id, field_list):
+    payload = {"ukb_folder": ukb_folder, "project_id": project_id, "fields": field_list}
+    return json.loads(request(url, "/baskets", payload))
+
+
+def extract(url, ukb_folder, field_to_basket, eids=None, format="parquet"):
+    # Return the data as Parquet or CSV bytes:
+    payload = {
+        "ukb_folder": ukb_folder,
+        "field_to_basket": field_to_basket,
+        "format": format,
+    }
+    if eids is not None:
+        payload["eids"] = list(eids)
+    return request(url, "/extract", payload)
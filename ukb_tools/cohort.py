@@ -0,0 +1,152 @@
+import numpy as np
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(bits):
+        return _POPCOUNT_TABLE[bits]
+
+
+_MAGIC = b"UKBCOHORT1"
+
+
+class Cohort:
+    """
+    Set of eids backed by a bitmap over the UKB eid space.
+
+    Each eid is stored as one bit, so a 500k-person cohort takes less than 1MB and
+    union/intersection/difference are single vectorized bitwise operations.
+
+    Supported eids are integers in [0, 2**31). Negative eids (e.g. withdrawn participants
+    in some releases) and non-integer values such as floats or NaN are rejected.
+    """
+
+    def __init__(self, eids=()):
+        # Sets, generators and other iterables are not converted by np.asarray:
+        if not isinstance(eids, (list, tuple)) and not hasattr(eids, "__array__"):
+            eids = list(eids)
+        eids = np.asarray(eids).ravel()
+        if eids.size == 0:
+            eids = eids.astype(np.int64)
+        if not np.issubdtype(eids.dtype, np.integer):
+            raise TypeError(
+                f"Cohort eids must be integers, got values of type {eids.dtype}."
+            )
+        eids = eids.astype(np.int64)
+        if eids.size and (eids.min() < 0 or eids.max() >= 2**31):
+            raise ValueError("Cohort eids must be integers in [0, 2**31).")
+        n_bits = int(eids.max()) + 1 if eids.size else 0
+        flags = np.zeros(n_bits, dtype=bool)
+        flags[eids] = True
+        self.bits = np.packbits(flags, bitorder="little")
+
+    @classmethod
+    def from_bits(cls, bits):
+        cohort = cls.__new__(cls)
+        cohort.bits = np.asarray(bits, dtype=np.uint8)
+        return cohort
+
+    @classmethod
+    def from_mask(cls, eids, mask):
+        return cls(np.asarray(eids)[np.asarray(mask, dtype=bool)])
+
+    def to_array(self):
+        # Sorted int32 array of the eids in the cohort:
+        flags = np.unpackbits(self.bits, bitorder="little")
+        return np.flatnonzero(flags).astype(np.int32)
+
+    def to_list(self):
+        return self.to_array().tolist()
+
+    def mask(self, eids):
+        # Boolean array flagging which of the given eids are in the cohort:
+        eids = np.asarray(eids, dtype=np.int64)
+        mask = np.zeros(eids.shape, dtype=bool)
+        valid = (eids >= 0) & (eids < self.bits.size * 8)
+        idx = eids[valid]
+        mask[valid] = (self.bits[idx >> 3] >> (idx & 7).astype(np.uint8)) & 1
+        return mask
+
+    def union(self, *others):
+        return self._reduce(np.bitwise_or, others, pad=True)
+
+    def intersection(self, *others):
+        return self._reduce(np.bitwise_and, others, pad=False)
+
+    def difference(self, *others):
+        bits = self.bits.copy()
+        for other in others:
+            n = min(bits.size, other.bits.size)
+            bits[:n] &= ~other.bits[:n]
+        return Cohort.from_bits(bits)
+
+    def _reduce(self, op, others, pad):
+        cohorts = (self,) + others
+        sizes = [c.bits.size for c in cohorts]
+        n = max(sizes) if pad else min(sizes)
+        bits = np.zeros(n, dtype=np.uint8)
+        m = min(n, self.bits.size)
+        bits[:m] = self.bits[:m]
+        for other in others:
+            m = min(n, other.bits.size)
+            if pad:
+                op(bits[:m], other.bits[:m], out=bits[:m])
+            else:
+                op(bits, other.bits[:n], out=bits)
+        return Cohort.from_bits(bits)
+
+    def save(self, path):
+        # Binary format: magic header followed by the raw bitmap
+        with open(path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(self._trimmed().tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a cohort binary file.")
+            return cls.from_bits(np.frombuffer(f.read(), dtype=np.uint8).copy())
+
+    def to_txt(self, path):
+        # Text format: one eid per line
+        with open(path, "w") as f:
+            for eid in self.to_array():
+                f.write(f"{eid}\n")
+
+    @classmethod
+    def from_txt(cls, path):
+        with open(path, "r") as f:
+            return cls([int(line) for line in f if line.strip()])
+
+    def _trimmed(self):
+        nonzero = np.flatnonzero(self.bits)
+        return self.bits[: nonzero[-1] + 1] if nonzero.size else self.bits[:0]
+
+    def __len__(self):
+        return int(_popcount(self.bits).sum(dtype=np.int64))
+
+    def __contains__(self, eid):
+        return bool(self.mask([eid])[0])
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __eq__(self, other):
+        if not isinstance(other, Cohort):
+            return NotImplemented
+        return np.array_equal(self._trimmed(), other._trimmed())
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def __repr__(self):
+        return f"Cohort({len(self)} eids)"
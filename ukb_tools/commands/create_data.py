@@ -0,0 +1,91 @@
+# Create the data based on the field-to-basket mapping produced by get_newest_baskets
+import sys
+import json
+import argparse
+from ..logger import logger
+
+
+def add_arguments(parser):
+    parser.add_argument("ukb_folder", help="Folder containing the UKB baskets.")
+    parser.add_argument(
+        "mapping_file", help="Path of JSON file containing the field-to-basket mapping."
+    )
+    parser.add_argument(
+        "out_file",
+        help="File to write the resulting dataframe, in Parquet if it ends with .parquet.",
+        default="raw_data.csv",
+        nargs="?",
+        const=1,
+    )
+    parser.add_argument(
+        "--eids",
+        help="Text file containing the eids to keep, one per line.",
+        default=None,
+    )
+    parser.add_argument(
+        "--server",
+        help="URL of a running extraction server to query instead of reading the baskets.",
+        default=None,
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def run(args):
+    try:
+        ukb_folder = args.ukb_folder
+        mapping_file = args.mapping_file
+        out_file = args.out_file
+
+        eids = None
+        if args.eids is not None:
+            with open(args.eids, "r") as f:
+                eids = [int(line) for line in f if line.strip()]
+
+        if args.server is not None:
+            _run_remote(args.server, ukb_folder, mapping_file, out_file, eids)
+            return
+
+        from ..tools import create_raw_data
+
+        # Create and save the data:
+        logger.info("Creating data...")
+        df = create_raw_data(mapping_file, ukb_folder, eids=eids)
+
+        # Save to Parquet or CSV file:
+        logger.info(f"Saving data to {out_file}")
+        if out_file.endswith(".parquet"):
+            df.to_parquet(out_file, index=False)
+        else:
+            df.to_csv(out_file, index=False)
+        logger.info("Data saved successfully.")
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        sys.exit()
+
+
+def _run_remote(server, ukb_folder, mapping_file, out_file, eids):
+    from ..client import extract
+
+    # Load field to basket mapping:
+    with open(mapping_file, "r") as f:
+        field_to_basket = json.load(f)
+
+    # Get the data from the extraction server, already in the output format:
+    logger.info(f"Requesting data from {server}...")
+    format = "parquet" if out_file.endswith(".parquet") else "csv"
+    data = extract(server, ukb_folder, field_to_basket, eids, format=format)
+
+    logger.info(f"Saving data to {out_file}")
+    with open(out_file, "wb") as f:
+        f.write(data)
+    logger.info("Data saved successfully.")
+
+
+def main():
+    # Parse arguments:
+    run(parse_args())
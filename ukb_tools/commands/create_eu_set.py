@@ -0,0 +1,66 @@
+# Create the European set of eids from UKB raw data
+import sys
+import argparse
+from ..logger import logger
+
+
+def add_arguments(parser):
+    parser.add_argument("raw_data", help="Path to UKB raw data in CSV.")
+    parser.add_argument(
+        "out_file",
+        help="Text file to write the resulting eids.",
+        default="eu_eids.txt",
+        nargs="?",
+        const=1,
+    )
+    parser.add_argument(
+        "--binary",
+        help="Save the eids as a binary cohort file instead of text.",
+        action="store_true",
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def run(args):
+    try:
+        from ..tools import get_data
+        from ..preprocess.filtering import filter_european_set
+
+        raw_data = args.raw_data
+        out_file = args.out_file
+
+        # Load UKB raw data
+        logger.info("Loading UKB raw data...")
+        eid = "eid"
+        ethnicity_field = "21000"
+        genetic_PC_field = "22009"
+        ukb_data = get_data(
+            raw_data, field_list=[eid, ethnicity_field, genetic_PC_field]
+        )
+        logger.info(f"Loaded UKB raw data from {raw_data}.")
+        ukb_data = ukb_data[[col for col in ukb_data.columns if "Unnamed" not in col]]
+
+        # Create european set:
+        eu_set = filter_european_set(ukb_data, cohort=True)
+
+        # Save eids:
+        logger.info("Saving European set eids...")
+        if args.binary:
+            eu_set.save(out_file)
+        else:
+            eu_set.to_txt(out_file)
+        logger.info(f"European set eids saved to {out_file}.")
+    except Exception as e:
+        logger.error(f"Failed in main execution: {e}")
+        sys.exit()
+
+
+def main():
+    # Parse arguments:
+    logger.info("Parsing arguments...")
+    run(parse_args())
@@ -0,0 +1,86 @@
+# Retrieve the most recent basket for a specified UKB project ID for each provided field
+# Save the field-to-basket mapping in JSON
+import sys
+import json
+import argparse
+from ..logger import logger
+
+
+def add_arguments(parser):
+    parser.add_argument("ukb_folder", help="Folder containing the UKB baskets.")
+    parser.add_argument("project_id", help="ID of the UKB project.")
+    parser.add_argument("field_list", help="Text file containing the fields.")
+    parser.add_argument(
+        "out_file",
+        help="JSON file to write the field-to-basket mapping",
+        default="field_to_basket.json",
+        nargs="?",
+        const=1,
+    )
+    parser.add_argument(
+        "--server",
+        help="URL of a running extraction server to query instead of reading the baskets.",
+        default=None,
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def run(args):
+    ukb_folder = args.ukb_folder
+    project_id = args.project_id
+    out_file = args.out_file
+
+    # Get list of field from the provided file:
+    logger.info("Retrieving fields from provided text file.")
+    try:
+        with open(args.field_list, "r") as f:
+            field_list = f.read().splitlines()
+    except FileNotFoundError:
+        logger.error(f"The specified file {args.field_list} was not found.")
+        sys.exit()
+    except Exception as e:
+        logger.error(f"An error occurred while reading the file: {e}")
+        sys.exit()
+
+    if args.server is not None:
+        # Retrieve the newest baskets from the extraction server:
+        from ..client import get_baskets
+
+        logger.info(f"Retrieving baskets from {args.server}.")
+        try:
+            baskets = get_baskets(args.server, ukb_folder, project_id, field_list)
+        except Exception as e:
+            logger.error(f"An error occurred while querying the server: {e}")
+            sys.exit()
+        for f, b in baskets.items():
+            if len(b) == 0:
+                logger.warning(f"Field {f} is missing in project {project_id}.")
+    else:
+        from ..tools import get_newest_baskets
+
+        # Retrieve the most recent basket for each provided field:
+        logger.info("Retrieving most recent basket for each field.")
+        baskets = get_newest_baskets(ukb_folder, project_id, field_list)
+
+    # Save baskets in JSON file:
+    logger.info("Saving the baskets in JSON file.")
+    try:
+        with open(out_file, "w") as f:
+            json.dump(baskets, f, indent=4, sort_keys=False)
+    except FileNotFoundError:
+        logger.error(f"Failed to open file: {out_file}. File not found.")
+        sys.exit()
+    except Exception as e:
+        logger.error(f"An error occurred while saving the baskets to JSON file: {e}")
+        sys.exit()
+
+
+def main():
+    # Parse arguments:
+    logger.info("Parsing arguments.")
+    run(parse_args())
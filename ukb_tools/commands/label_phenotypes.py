@@ -0,0 +1,90 @@
+# Label many phenotypes at once from a file of phenotype definitions
+# Save the case/control matrix and the first diagnosis date matrix in CSV
+import sys
+import json
+import argparse
+from ..logger import logger
+
+# Date fields of the ICD10 (41270) and ICD9 (41271) diagnoses:
+DEFAULT_DIAGNOSIS_DATE_FIELDS = {"41270": "41280", "41271": "41281"}
+
+
+def add_arguments(parser):
+    parser.add_argument("raw_data", help="Path to UKB raw data in CSV.")
+    parser.add_argument(
+        "phenotypes", help="Path of JSON file containing the phenotype definitions."
+    )
+    parser.add_argument(
+        "out_labels",
+        help="CSV file to write the case/control matrix.",
+        default="labels.csv",
+        nargs="?",
+        const=1,
+    )
+    parser.add_argument(
+        "out_dates",
+        help="CSV file to write the first diagnosis date matrix.",
+        default="diagnosis_dates.csv",
+        nargs="?",
+        const=1,
+    )
+    parser.add_argument(
+        "--date_fields",
+        help="Path of JSON file containing the field-to-date-field mapping.",
+        default=None,
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def run(args):
+    try:
+        from ..tools import get_data
+        from ..preprocess.labeling import label_phenotypes, load_phenotype_definitions
+
+        raw_data = args.raw_data
+        out_labels = args.out_labels
+        out_dates = args.out_dates
+
+        # Load phenotype definitions and diagnosis date fields:
+        logger.info("Loading phenotype definitions...")
+        phenotypes = load_phenotype_definitions(args.phenotypes)
+        diagnosis_date_fields = DEFAULT_DIAGNOSIS_DATE_FIELDS
+        if args.date_fields is not None:
+            with open(args.date_fields, "r") as f:
+                diagnosis_date_fields = json.load(f)
+        logger.info(f"Loaded {len(phenotypes)} phenotype definitions.")
+
+        # Load only the code and date columns needed by the phenotypes:
+        logger.info("Loading UKB raw data...")
+        code_fields = {field_id for rules in phenotypes.values() for field_id, _ in rules}
+        date_fields = set(diagnosis_date_fields.values()) | {"53"}
+        field_list = ["eid"] + sorted(code_fields | date_fields)
+        ukb_data = get_data(raw_data, field_list=field_list).set_index("eid")
+        logger.info(f"Loaded UKB raw data from {raw_data}.")
+
+        # Label all phenotypes in a single scan:
+        logger.info("Labeling phenotypes...")
+        labels, diagnosis_dates = label_phenotypes(
+            ukb_data, phenotypes, diagnosis_date_fields
+        )
+
+        # Save to CSV files:
+        logger.info(f"Saving labels to {out_labels}")
+        labels.astype(int).to_csv(out_labels)
+        logger.info(f"Saving first diagnosis dates to {out_dates}")
+        diagnosis_dates.to_csv(out_dates, date_format="%Y-%m-%d")
+        logger.info("Labels saved successfully.")
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        sys.exit()
+
+
+def main():
+    # Parse arguments:
+    logger.info("Parsing arguments...")
+    run(parse_args())
@@ -0,0 +1,40 @@
+# Start the resident extraction server, keeping UKB data in memory across requests
+import sys
+import argparse
+from ..logger import logger
+
+
+def add_arguments(parser):
+    parser.add_argument("ukb_folder", help="Folder containing the UKB baskets.")
+    parser.add_argument(
+        "--host", help="Loopback address to bind the server.", default="127.0.0.1"
+    )
+    parser.add_argument("--port", help="Port to bind the server.", type=int, default=8765)
+    parser.add_argument(
+        "--max_cache_mb",
+        help="Maximum memory used by the cached columns, in MB.",
+        type=int,
+        default=4096,
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    add_arguments(parser)
+    return parser.parse_args()
+
+
+def run(args):
+    try:
+        from ..server import serve
+
+        serve(args.ukb_folder, args.host, args.port, args.max_cache_mb)
+    except Exception as e:
+        logger.error(f"An error occurred: {e}")
+        sys.exit()
+
+
+def main():
+    # Parse arguments:
+    logger.info("Parsing arguments...")
+    run(parse_args())
@@ -1,30 +1,50 @@
 # Feel free to add any useful filtering functions here.
 # Please make sure that each function don't modidy the original argument and:
 #       - takes a DataFrame containing UKB data as the first argument
-#       - returns the list of filtered eids
+#       - returns the list of filtered eids, or a Cohort when called with cohort=True
 import sys
 import numpy as np
 import pandas as pd
 from functools import reduce
+from ..cohort import Cohort
 from ..tools import filter_cols
 from ..logger import logger
 from .utils import compute_medoid_mem_efficient
 
 
+def _eid_cohort(ukb_data: pd.DataFrame, rows) -> Cohort:
+    # Key the cohort on eids, whether they are stored in the "eid" column or in the index:
+    if "eid" in ukb_data.columns:
+        eids = ukb_data["eid"].to_numpy()
+    else:
+        eids = ukb_data.index.to_numpy()
+    eids = eids[np.asarray(rows, dtype=bool)]
+
+    # Drop eids outside of the cohort domain, e.g. negative eids of withdrawn participants:
+    valid = (eids >= 0) & (eids < 2**31)
+    if not valid.all():
+        logger.warning(
+            f"Dropping {(~valid).sum()} eids outside of the cohort domain [0, 2**31)."
+        )
+    return Cohort(eids[valid])
+
+
 def filter_fully_populated_rows(
-    ukb_data: pd.DataFrame, field_ids: list[str]
-) -> list[int]:
+    ukb_data: pd.DataFrame, field_ids: list[str], cohort: bool = False
+) -> list[int] | Cohort:
     # Subset data for columns matching the specified field_ids
     cols = filter_cols(ukb_data.columns, field_ids)
     df = ukb_data[cols]
     # Remove row that contains NaN value and return valid eids
+    if cohort:
+        return _eid_cohort(ukb_data, df.notna().all(axis=1))
     eids = df.dropna().index
     return list(eids)
 
 
 def filter_partially_populated_rows(
-    ukb_data: pd.DataFrame, field_ids: list[str]
-) -> list[int]:
+    ukb_data: pd.DataFrame, field_ids: list[str], cohort: bool = False
+) -> list[int] | Cohort:
     # Initialize a list to store boolean Series for each field ID indicating non-NaN rows
     valid_data_flags = []
 
@@ -40,10 +60,14 @@ def filter_partially_populated_rows(
     valid_rows = reduce(lambda x, y: x | y, valid_data_flags)
 
     # Return eids of valid rows
+    if cohort:
+        return _eid_cohort(ukb_data, valid_rows)
     return list(ukb_data[valid_rows].index)
 
 
-def filter_ethnicity(ukb_data: pd.DataFrame, ethnicity_code: int) -> list[int]:
+def filter_ethnicity(
+    ukb_data: pd.DataFrame, ethnicity_code: int, cohort: bool = False
+) -> list[int] | Cohort:
     logger.info("Filtering ethnicity...")
     try:
         # Keep eid and ethnicity:
@@ -71,13 +95,18 @@ def filter_ethnicity(ukb_data: pd.DataFrame, ethnicity_code: int) -> list[int]:
         df = df[df[ethnicity_field] == ethnicity_code]
 
         logger.info(f"Filtered ethnicity successfully, {len(df)} rows retained.")
-        return ukb_data.index.isin(df.index)
+        valid_rows = ukb_data.index.isin(df.index)
+        if cohort:
+            return _eid_cohort(ukb_data, valid_rows)
+        return valid_rows
     except Exception as e:
         logger.error(f"Error filtering ethnicity: {e}")
         sys.exit()
 
 
-def filter_european_set(ukb_data: pd.DataFrame) -> list[int]:
+def filter_european_set(
+    ukb_data: pd.DataFrame, cohort: bool = False
+) -> list[int] | Cohort:
     try:
         # Filter individuals with self-reported “British” (code 1001) ancestry according to UKB field 21000:
         eids = filter_ethnicity(ukb_data, ethnicity_code=1001)
@@ -107,10 +136,13 @@ def filter_european_set(ukb_data: pd.DataFrame) -> list[int]:
         )
 
         # Select all individuals with a British-medoid distance of less than 40:
-        eids = list(ukb_data[distances < 40].eid)
+        valid_rows = distances < 40
+        eids = list(ukb_data[valid_rows].eid)
         logger.info(
             f"Created European set successfully, {len(eids)} individuals included."
         )
+        if cohort:
+            return _eid_cohort(ukb_data, valid_rows)
         return eids
     except Exception as e:
         logger.error(f"Error creating European set: {e}")
@@ -1,7 +1,11 @@
+import json
+from functools import lru_cache
 from typing import List, Tuple, Callable, Dict
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from ..tools import filter_cols, split_ukb_column, generate_ukb_column
+from ..logger import logger
 
 
 def match_phenotype(
@@ -86,7 +90,8 @@ def get_diagnosis_dates(
             array_id = 0
 
         date_col = generate_ukb_column(date_field, instance_id, array_id)
-        dates.append(row[date_col])
+        if date_col in row.index:
+            dates.append(row[date_col])
     return dates
 
 
@@ -107,10 +112,190 @@ def get_first_diagnosis_date(
     str: The earliest diagnosis date in "YYYY-MM-DD" format, or an empty string if no dates are found.
     """
     diagnosis_dates = get_diagnosis_dates(row, phenotype_rules, diagnosis_date_fields)
-    dates = [datetime.strptime(date, "%Y-%m-%d") for date in diagnosis_dates if date]
+    dates = [
+        datetime.strptime(date, "%Y-%m-%d")
+        for date in diagnosis_dates
+        if isinstance(date, str) and date
+    ]
 
     if dates:
         first_date = min(dates)
         return first_date.strftime("%Y-%m-%d")
     else:
         return ""
+
+
+def _decode_values(values: np.ndarray, field_id: str) -> np.ndarray:
+    """
+    Decode values the same way as the row-wise matching functions do.
+    """
+    if field_id in ["41271", "41270"]:  # Specific handling for ICD codes
+        return np.array([str(val) for val in values], dtype=object)
+    return values
+
+
+def label_phenotypes(
+    ukb_data: pd.DataFrame,
+    phenotypes: Dict[str, List[Tuple[str, Callable[[str], bool]]]],
+    diagnosis_date_fields: Dict[str, str],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Label many phenotypes at once in a single scan of the code columns.
+
+    The non-null values of all the columns of a field are stacked and factorized once, and
+    each distinct condition is evaluated once per distinct code of the field. The cases and
+    first diagnosis dates of each phenotype are then computed from the sparse list of
+    matching cells, with date columns parsed once and shared by all phenotypes.
+
+    Parameters:
+    ukb_data (pd.DataFrame): The UKB data indexed by eid.
+    phenotypes (dict): A mapping from phenotype names to their phenotype rules, as used by match_phenotype.
+    diagnosis_date_fields (dict): A mapping from field IDs to their respective date fields.
+
+    Returns:
+    tuple:
+        - pd.DataFrame: Boolean case/control matrix (eids x phenotypes).
+        - pd.DataFrame: First diagnosis date matrix (eids x phenotypes), NaT if no date is found.
+    """
+    n_rows = len(ukb_data)
+    nat = np.datetime64("NaT", "ns")
+    cases = {name: np.zeros(n_rows, dtype=bool) for name in phenotypes}
+    first_dates = {name: np.full(n_rows, nat) for name in phenotypes}
+
+    # Group the phenotypes by field and condition, so that each is evaluated only once:
+    rules_by_field = {}
+    for name, phenotype_rules in phenotypes.items():
+        for field_id, condition in phenotype_rules:
+            names = rules_by_field.setdefault(field_id, {}).setdefault(condition, [])
+            if name not in names:
+                names.append(name)
+
+    parsed_dates = {}
+
+    def get_dates(date_col):
+        # Parse each date column once and share it across phenotypes:
+        if date_col not in parsed_dates:
+            if date_col in ukb_data.columns:
+                parsed_dates[date_col] = pd.to_datetime(
+                    ukb_data[date_col], format="%Y-%m-%d", errors="coerce"
+                ).to_numpy(dtype="datetime64[ns]")
+            else:
+                logger.warning(f"Date column {date_col} not found in the data.")
+                parsed_dates[date_col] = None
+        return parsed_dates[date_col]
+
+    for field_id, conditions in rules_by_field.items():
+        cols = filter_cols(ukb_data.columns, [field_id])
+        if not cols:
+            continue
+
+        # Stack the non-null values of the field into (row, col, code) once:
+        values = ukb_data[cols].to_numpy()
+        rows, col_ids = np.nonzero(pd.notna(values))
+        codes, uniques = pd.factorize(_decode_values(values[rows, col_ids], field_id))
+        null_value = _decode_values(np.array([np.nan], dtype=object), field_id)[0]
+        null_cells = None
+
+        # Date column associated to each column of the field:
+        date_cols = []
+        for col in cols:
+            _, instance_id, array_id = split_ukb_column(col)
+            try:
+                date_field = diagnosis_date_fields[field_id]
+            except KeyError:
+                date_field = "53"  # Default field if not specified
+                array_id = 0
+            date_cols.append(generate_ukb_column(date_field, instance_id, array_id))
+
+        for condition, names in conditions.items():
+            # Evaluate the condition once per distinct code and keep the matching cells:
+            hits = np.fromiter(
+                (bool(condition(val)) for val in uniques),
+                dtype=bool,
+                count=len(uniques),
+            )
+            hit_cells = np.flatnonzero(hits[codes])
+            hit_rows, hit_cols = rows[hit_cells], col_ids[hit_cells]
+            if condition(null_value):
+                # Null values match too, as with the row-wise functions:
+                if null_cells is None:
+                    null_cells = np.nonzero(pd.isna(values))
+                hit_rows = np.concatenate([hit_rows, null_cells[0]])
+                hit_cols = np.concatenate([hit_cols, null_cells[1]])
+            if hit_rows.size == 0:
+                continue
+
+            # Gather the diagnosis date of each matching cell, column by column:
+            order = np.argsort(hit_cols, kind="stable")
+            hit_rows, hit_cols = hit_rows[order], hit_cols[order]
+            hit_dates = np.full(hit_rows.size, nat)
+            col_values, starts = np.unique(hit_cols, return_index=True)
+            ends = np.append(starts[1:], hit_cols.size)
+            for col_id, start, end in zip(col_values, starts, ends):
+                dates = get_dates(date_cols[col_id])
+                if dates is not None:
+                    hit_dates[start:end] = dates[hit_rows[start:end]]
+
+            for name in names:
+                cases[name][hit_rows] = True
+                np.fmin.at(first_dates[name], hit_rows, hit_dates)
+
+    labels = pd.DataFrame(cases, index=ukb_data.index)
+    diagnosis_dates = pd.DataFrame(first_dates, index=ukb_data.index)
+    return labels, diagnosis_dates
+
+
+def _normalize_code(val) -> str:
+    """
+    Convert a UKB code to its string representation, e.g. 1075.0 -> "1075".
+    """
+    if isinstance(val, float) and val.is_integer():
+        return str(int(val))
+    return str(val)
+
+
+@lru_cache(maxsize=None)
+def _make_condition(kind: str, codes: Tuple[str, ...]) -> Callable[[str], bool]:
+    # Cached, so that identical rules share the same condition:
+    if kind == "startswith":
+        return lambda val: _normalize_code(val).startswith(codes)
+    code_set = frozenset(codes)
+    return lambda val: _normalize_code(val) in code_set
+
+
+def _build_condition(rule: dict) -> Callable[[str], bool]:
+    for kind in ["startswith", "isin"]:
+        if kind in rule:
+            codes = tuple(sorted(str(code) for code in rule[kind]))
+            return _make_condition(kind, codes)
+    raise ValueError(
+        f"Invalid rule {rule}. Expected a 'startswith' or an 'isin' condition."
+    )
+
+
+def load_phenotype_definitions(
+    definitions_file: str,
+) -> Dict[str, List[Tuple[str, Callable[[str], bool]]]]:
+    """
+    Load phenotype definitions from a JSON file and convert them to phenotype rules.
+
+    The file maps each phenotype name to a list of rules, each rule giving a field ID and
+    either a list of code prefixes ("startswith") or a list of codes ("isin"), e.g.:
+        {"CAD": [{"field_id": "41270", "startswith": ["I21", "I22"]},
+                 {"field_id": "20002", "isin": ["1075"]}]}
+
+    Parameters:
+    definitions_file (str): Path of the JSON file containing the phenotype definitions.
+
+    Returns:
+    dict: A mapping from phenotype names to their phenotype rules.
+    """
+    with open(definitions_file, "r") as f:
+        definitions = json.load(f)
+
+    phenotypes = {}
+    for name, rules in definitions.items():
+        phenotypes[name] = [
+            (str(rule["field_id"]), _build_condition(rule)) for rule in rules
+        ]
+    return phenotypes
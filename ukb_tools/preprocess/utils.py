@@ -1,10 +1,8 @@
 import sys
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 from ..tools import filter_cols
 from ..logger import logger
-from scipy.spatial.distance import cdist, pdist, squareform
 
 
 def rename_features(ukb_data: pd.DataFrame, features: dict) -> (pd.DataFrame, list):
@@ -44,6 +42,8 @@ def rename_features(ukb_data: pd.DataFrame, features: dict) -> (pd.DataFrame, li
 
 
 def compute_medoid(X):
+    from scipy.spatial.distance import pdist, squareform
+
     # Drop NaN and convert to numpy
     X = X.dropna().copy()
     X = X.to_numpy()
@@ -66,6 +66,9 @@ def compute_medoid(X):
 
 
 def compute_medoid_mem_efficient(X):
+    from tqdm import tqdm
+    from scipy.spatial.distance import cdist
+
     # Drop NaN and convert to numpy
     X = X.dropna().copy()
     X = X.to_numpy()
@@ -0,0 +1,183 @@
+# Resident extraction server keeping recently used UKB columns in memory
+import io
+import os
+import json
+import socket
+import ipaddress
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pandas as pd
+from .logger import logger
+from .tools import filter_cols, get_column_names, get_newest_baskets
+from .tools import merge_basket_data, read_ukb_csv
+
+
+class ColumnCache:
+    """
+    Thread-safe LRU cache of CSV columns, bounded by the memory used by the cached columns.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self.columns = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.columns:
+                return None
+            self.columns.move_to_end(key)
+            return self.columns[key][0]
+
+    def put(self, key, column):
+        size = int(column.memory_usage(index=False, deep=True))
+        with self.lock:
+            if key in self.columns:
+                self.n_bytes -= self.columns.pop(key)[1]
+            self.columns[key] = (column, size)
+            self.n_bytes += size
+            # Evict least recently used columns, always keeping the last one:
+            while self.n_bytes > self.max_bytes and len(self.columns) > 1:
+                _, (_, evicted_size) = self.columns.popitem(last=False)
+                self.n_bytes -= evicted_size
+
+
+class ExtractionService:
+    """
+    Serve the same results as get_newest_baskets and create_raw_data, keeping CSV headers
+    and columns in memory. Cache entries are keyed on the CSV modification time, so that
+    replaced files are never served stale.
+    """
+
+    def __init__(self, ukb_folder, max_cache_bytes):
+        self.ukb_folder = ukb_folder
+        self.cache = ColumnCache(max_cache_bytes)
+        self.headers = {}
+        self.path_locks = {}
+        self.lock = threading.Lock()
+
+    def check_folder(self, ukb_folder):
+        # Requests mirror the CLI, make sure they target the folder served:
+        if ukb_folder is not None and os.path.realpath(ukb_folder) != os.path.realpath(
+            self.ukb_folder
+        ):
+            raise ValueError(
+                f"Server serves {self.ukb_folder}, but request targets {ukb_folder}."
+            )
+
+    def check_baskets(self, baskets):
+        # Only serve baskets listed in the folder, e.g. no "../" in basket names:
+        available = set(os.listdir(self.ukb_folder))
+        for basket in baskets:
+            if basket and (not isinstance(basket, str) or basket not in available):
+                raise ValueError(f"Unknown basket {basket!r} in {self.ukb_folder}.")
+
+    def get_baskets(self, project_id, field_list):
+        # Baskets are listed at each call, so that new baskets are served as by the CLI:
+        return get_newest_baskets(self.ukb_folder, project_id, field_list)
+
+    def _path_lock(self, path):
+        with self.lock:
+            return self.path_locks.setdefault(path, threading.Lock())
+
+    def load_data(self, main_ukb_path, field_list):
+        # Same result as get_data, reading only the columns that are not cached yet:
+        mtime = os.stat(main_ukb_path).st_mtime_ns
+        with self._path_lock(main_ukb_path):
+            header_mtime, header = self.headers.get(main_ukb_path, (None, None))
+            if header_mtime != mtime:
+                header = get_column_names(main_ukb_path)
+                self.headers[main_ukb_path] = (mtime, header)
+            cols = filter_cols(header, field_list)
+
+            columns = {col: self.cache.get((main_ukb_path, mtime, col)) for col in cols}
+            missing = [col for col, column in columns.items() if column is None]
+            if missing:
+                logger.info(f"Reading {len(missing)} columns from {main_ukb_path}")
+                df = read_ukb_csv(main_ukb_path, missing)
+                for col in df.columns:
+                    # Copy, as columns of a read can be views into one block, which would
+                    # stay alive as long as any of its columns is cached:
+                    column = df[col].copy()
+                    self.cache.put((main_ukb_path, mtime, col), column)
+                    columns[col] = column
+                del df
+        return pd.DataFrame({col: columns[col] for col in cols})
+
+    def extract(self, field_to_basket, eids=None):
+        self.check_baskets(field_to_basket.values())
+        return merge_basket_data(
+            field_to_basket, self.ukb_folder, eids=eids, load_data=self.load_data
+        )
+
+
+class ExtractionServer(ThreadingHTTPServer):
+    # Accept many concurrent clients without resetting connections:
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class ExtractionHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            service = self.server.service
+            service.check_folder(request.get("ukb_folder"))
+
+            if self.path == "/baskets":
+                baskets = service.get_baskets(request["project_id"], request["fields"])
+                self._send(200, "application/json", json.dumps(baskets).encode())
+            elif self.path == "/extract":
+                df = service.extract(request["field_to_basket"], request.get("eids"))
+                if request.get("format", "parquet") == "csv":
+                    body = df.to_csv(index=False).encode()
+                    self._send(200, "text/csv", body)
+                else:
+                    buffer = io.BytesIO()
+                    df.to_parquet(buffer, index=False)
+                    self._send(200, "application/vnd.apache.parquet", buffer.getvalue())
+            else:
+                self._send(404, "text/plain", f"Unknown path {self.path}".encode())
+        except (ValueError, KeyError) as e:
+            logger.error(f"Invalid request to {self.path}: {e}")
+            self._send(400, "text/plain", str(e).encode())
+        except (Exception, SystemExit) as e:
+            logger.error(f"An error occurred while handling {self.path}: {e}")
+            self._send(500, "text/plain", str(e).encode())
+
+    def _send(self, code, content_type, body):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def serve(ukb_folder, host="127.0.0.1", port=8765, max_cache_mb=4096):
+    # Fail at startup rather than on each request if Parquet output is unavailable:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            'pyarrow is required by the extraction server, run pip install -e ".[server]"'
+        )
+
+    # The server has no authentication and serves participant-level data:
+    if not ipaddress.ip_address(socket.gethostbyname(host)).is_loopback:
+        raise ValueError(f"The server can only bind a loopback address, got {host}.")
+
+    server = ExtractionServer((host, port), ExtractionHandler)
+    server.service = ExtractionService(ukb_folder, max_cache_mb * 1024**2)
+    logger.info(f"Serving UKB data from {ukb_folder} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down server.")
+    finally:
+        server.server_close()
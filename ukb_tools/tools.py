@@ -2,7 +2,6 @@ import os
 import csv
 import sys
 import json
-import pandas as pd
 import functools as ft
 from .logger import logger
 
@@ -41,33 +40,64 @@ def get_baskets(ukb_folder, project_id, field_list):
     return basket_dict
 
 
-def create_raw_data(mapping_file, ukb_folder):
+def get_newest_baskets(ukb_folder, project_id, field_list):
+    # Retrieve baskets for the specified UKB project ID for each provided field:
+    baskets = get_baskets(ukb_folder, project_id, field_list)
+
+    # Keep only the newest basket:
+    for f, b in baskets.items():
+        if len(b) == 0:
+            logger.warning(f"Field {f} is missing in project {project_id}.")
+        else:
+            baskets[f] = max(b)
+    return baskets
+
+
+def get_basket_path(ukb_folder, basket):
+    _, basket_id = split_ukb_path(basket)
+    return os.path.join(ukb_folder, basket, f"ukb{basket_id}.csv")
+
+
+def merge_basket_data(field_to_basket, ukb_folder, eids=None, load_data=None):
+    # load_data(main_ukb_path, field_list) returns the fields of a basket, get_data by default
+    import pandas as pd
+
+    if load_data is None:
+        load_data = get_data
+
+    # Revert mapping, skipping fields missing from the project:
+    basket_to_fields = {}
+    for key, value in field_to_basket.items():
+        if not value:
+            continue
+        if value not in basket_to_fields:
+            basket_to_fields[value] = [key]
+        else:
+            basket_to_fields[value].append(key)
+
+    # For each baskets load the corresponding fields:
+    dfs = []
+    for basket, field_list in basket_to_fields.items():
+        main_ukb_path = get_basket_path(ukb_folder, basket)
+        logger.info(f"Loading data from {main_ukb_path}")
+        df = load_data(main_ukb_path, ["eid"] + field_list)
+        if df is not None:
+            dfs.append(df)
+
+    # Join all dataframe on "eid" columns:
+    df = ft.reduce(lambda left, right: pd.merge(left, right, on="eid"), dfs)
+    if eids is not None:
+        df = df[df["eid"].isin(eids)]
+    return df
+
+
+def create_raw_data(mapping_file, ukb_folder, eids=None):
     try:
         # Load field to basket mapping:
         with open(mapping_file, "r") as f:
             field_to_basket = json.load(f)
 
-        # Revert mapping:
-        basket_to_fields = {}
-        for key, value in field_to_basket.items():
-            if value not in basket_to_fields:
-                basket_to_fields[value] = [key]
-            else:
-                basket_to_fields[value].append(key)
-
-        # For each baskets load the corresponding fields:
-        dfs = []
-        for basket, field_list in basket_to_fields.items():
-            _, basket_id = split_ukb_path(basket)
-            main_ukb_path = os.path.join(ukb_folder, basket, f"ukb{basket_id}.csv")
-            logger.info(f"Loading data from {main_ukb_path}")
-            df = get_data(main_ukb_path, ["eid"] + field_list)
-            if df is not None:
-                dfs.append(df)
-
-        # Join all dataframe on "eid" columns:
-        df = ft.reduce(lambda left, right: pd.merge(left, right, on="eid"), dfs)
-        return df
+        return merge_basket_data(field_to_basket, ukb_folder, eids=eids)
     except Exception as e:
         logger.error(f"An error occurred while creating data: {e}")
         sys.exit()
@@ -86,11 +116,21 @@ def get_column_names(csv_file):
         sys.exit()
 
 
+def read_ukb_csv(main_ukb_path, cols, nrows=None):
+    import pandas as pd
+
+    # Without low_memory, the dtype of each column is inferred on the whole column,
+    # whichever other columns are read along with it:
+    return pd.read_csv(
+        main_ukb_path, usecols=cols, nrows=nrows, encoding="latin1", low_memory=False
+    )
+
+
 def get_data(main_ukb_path, field_list, nrows=None):
     try:
         cols = get_column_names(main_ukb_path)
         cols = filter_cols(cols, field_list)
-        df = pd.read_csv(main_ukb_path, usecols=cols, nrows=nrows, encoding="latin1")
+        df = read_ukb_csv(main_ukb_path, cols, nrows=nrows)
         return df
     except Exception as e:
         logger.error(f"An error occurred while getting data from {main_ukb_path}: {e}")
@@ -98,6 +138,8 @@ def get_data(main_ukb_path, field_list, nrows=None):
 
 
 def get_dtypes(ukb_dict_path, columns):
+    import pandas as pd
+
     ukb_dict = pd.read_csv(ukb_dict_path, sep="\t", dtype=str)
     dtypes = {}
 